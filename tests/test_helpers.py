@@ -85,6 +85,29 @@ class TestHelpers(unittest.TestCase):
         self.assertEquals(transform_octet_to_mac(u'\xe4\xc7"\xdbJ\x08'), u'E4:C7:22:DB:4A:08')
         self.assertEquals(transform_octet_to_mac(u'\xe4\xc7"\xdbJ\t'), u'E4:C7:22:DB:4A:09')
 
+    def test_lazy_once(self):
+        class Target(object):
+            def __init__(self):
+                self.compute_count = 0
+
+            @lazy_once
+            def answer(self):
+                """The answer"""
+                self.compute_count += 1
+                return 42
+
+        self.assertEqual(Target.answer.__doc__, u'The answer')
+
+        target = Target()
+        self.assertNotIn('answer', target.__dict__)
+        self.assertEqual(target.answer, 42)
+        self.assertEqual(target.compute_count, 1)
+
+        # the computed value is published into the instance __dict__ and shadows the descriptor
+        self.assertIn('answer', target.__dict__)
+        self.assertEqual(target.answer, 42)
+        self.assertEqual(target.compute_count, 1)
+
     def test_celsius_conversion(self):
         self.assertEqual(convert_celsius_to_fahrenheit(0), 32)
         self.assertEqual(convert_celsius_to_fahrenheit(100), 212)
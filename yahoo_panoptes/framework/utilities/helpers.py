@@ -458,3 +458,29 @@ def convert_netmask_to_cidr(netmask):
     """
 
     return sum([bin(int(x)).count(u"1") for x in netmask.split(u".")])
+
+
+class lazy_once(object):
+    """
+    A lazily-initialized cached property with a lock-free read path
+
+    The computed value is published into the instance __dict__ under the property name, so normal attribute
+    lookup shadows the descriptor and every read after the first carries no locking or descriptor overhead.
+    Unlike cached_property.threaded_cached_property there is no lock on first access either: if two threads
+    race on the very first read, the function may run more than once with one result winning. Callers whose
+    computation must be strictly single-shot should keep using threaded_cached_property.
+    """
+    def __init__(self, func):
+        self._func = func
+        self.__doc__ = getattr(func, u'__doc__')
+        self.__name__ = func.__name__
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+
+        value = self._func(instance)
+        # Publish through object.__setattr__ so the value lands in the instance __dict__ in a single atomic
+        # store, regardless of any __setattr__ override on the owning class
+        object.__setattr__(instance, self.__name__, value)
+        return value
@@ -11,6 +11,7 @@ class MibSNMPV2(Mib):
     sysDescr = oid('.1.3.6.1.2.1.1.1')
     interfaces = oid('.1.3.6.1.2.1.2')
 
+    hrStorageEntry = oid('.1.3.6.1.2.1.25.2.3.1')
     hrStorageType = oid('.1.3.6.1.2.1.25.2.3.1.2')
     hrStorageDescr = oid('.1.3.6.1.2.1.25.2.3.1.3')
     hrStorageAllocationUnits = oid('.1.3.6.1.2.1.25.2.3.1.4')
@@ -2,14 +2,14 @@
 Copyright 2018, Oath Inc.
 Licensed under the terms of the Apache 2.0 license. See LICENSE file in project root for terms.
 """
-from builtins import zip
 import collections
 import re
 
-from cached_property import threaded_cached_property
+from concurrent.futures import ThreadPoolExecutor
 
 from yahoo_panoptes.enrichment.schema.generic import snmp
 from yahoo_panoptes.framework import const, enrichment
+from yahoo_panoptes.framework.utilities.helpers import lazy_once
 from yahoo_panoptes.plugins.enrichment.generic.snmp import plugin_enrichment_generic_snmp
 
 from yahoo_panoptes.framework.utilities.snmp.mibs.snmpv2 import MibSNMPV2
@@ -20,7 +20,76 @@ FAN_TYPES = [r'Fan Tray \d+ Fan \d+', r'Fan Tray \d+', r'FAN \d+', r'node\d SRX\
              r'node\d \w+ Tray Fan \d+', r'(Top|Bottom)\s(Rear|Middle|Front)\sFan']
 POWER_MODULE_TYPES = [r'PDM \d{1,2}$', 'PEM', r'PSM \d{1,2}$', r'Power Supply \d$', r'Power Supply: Power Supply \d+ @',
                       r'node\d PEM \d']
-TYPE_MAP = dict(list(zip(POWER_MODULE_TYPES, [u'PDM', u'PEM', u'PSM', u'PEM', u'PEM', u'PEM'])))
+TYPE_MAP = {
+    POWER_MODULE_TYPES[0]: u'PDM',
+    POWER_MODULE_TYPES[1]: u'PEM',
+    POWER_MODULE_TYPES[2]: u'PSM',
+    POWER_MODULE_TYPES[3]: u'PEM',
+    POWER_MODULE_TYPES[4]: u'PEM',
+    POWER_MODULE_TYPES[5]: u'PEM',
+}
+CPU_KEYWORDS = ('routing engine', 'fpc', 'fpm', 'cp', 'pic', 'fbc')
+
+# One case-insensitive C-level scan per entity name instead of one Python-level substring probe per keyword
+_CPU_RE = re.compile('|'.join(CPU_KEYWORDS), re.IGNORECASE)
+
+
+def _partition_literal_patterns(patterns):
+    """
+    Splits a list of regex patterns into pure literals and residual regex patterns
+
+    Since entity names are matched with re.match, a pattern without regex metacharacters is equivalent to a
+    str.startswith check, which bypasses the regex machinery entirely
+
+    Args:
+        patterns (list): The regex patterns to partition
+
+    Returns:
+        tuple: A tuple of the pure literal patterns and the residual regex patterns
+    """
+    literals = tuple(pattern for pattern in patterns if re.escape(pattern) == pattern)
+    residual = [pattern for pattern in patterns if re.escape(pattern) != pattern]
+    return literals, residual
+
+
+# Match pure-literal type patterns with a plain prefix table and combine the residual patterns into single compiled
+# alternations so that classifying an entity name takes one C-level scan instead of one Python-level re.match call
+# per type. FAN_TYPES contains no pure literals, so all of its patterns stay in _FAN_RE.
+_FAN_LITERAL_PREFIXES, _FAN_RESIDUAL_TYPES = _partition_literal_patterns(FAN_TYPES)
+_PM_LITERAL_PREFIXES, _PM_RESIDUAL_TYPES = _partition_literal_patterns(POWER_MODULE_TYPES)
+_PM_LITERAL_PREFIX_TYPES = {pattern: TYPE_MAP[pattern] for pattern in _PM_LITERAL_PREFIXES}
+_FAN_RE = re.compile('|'.join('(?:{})'.format(pattern) for pattern in _FAN_RESIDUAL_TYPES))
+_PM_RE = re.compile('|'.join('(?P<pm{}>{})'.format(i, pattern) for i, pattern in enumerate(_PM_RESIDUAL_TYPES)))
+_PM_INDEX_TO_TYPE = [TYPE_MAP[pattern] for pattern in _PM_RESIDUAL_TYPES]
+
+
+# The Mib oid members are constants, but str() on them walks __str__ and allocates a fresh string per call;
+# bind the strings once at import
+_OID_ENTITY_DESCR = MibJuniper.jnxOperatingDescr.oid
+_OID_TEMP = str(MibJuniper.jnxOperatingTemp)
+_OID_MEMORY = str(MibJuniper.jnxOperatingMemory)
+_OID_BUFFER = str(MibJuniper.jnxOperatingBuffer)
+_OID_STATE = str(MibJuniper.jnxOperatingState)
+_OID_CPU = MibJuniper.jnxOperatingCPU.oid
+_OID_CPU_1MIN = str(MibJuniper.jnxOperating1MinAvgCPU)
+_OID_CPU_5MIN = str(MibJuniper.jnxOperating5MinAvgCPU)
+_OID_CPU_15MIN = str(MibJuniper.jnxOperating15MinAvgCPU)
+_OID_STORAGE_ENTRY = str(MibSNMPV2.hrStorageEntry)
+_OID_STORAGE_ALLOCATION_FAILURES = str(MibSNMPV2.hrStorageAllocationFailures)
+_OID_STORAGE_USED = str(MibSNMPV2.hrStorageUsed)
+
+# hrStorageEntry column numbers ( https://tools.ietf.org/html/rfc2790.html )
+_STORAGE_TYPE_COLUMN = u'2'
+_STORAGE_DESCR_COLUMN = u'3'
+_STORAGE_ALLOCATION_UNITS_COLUMN = u'4'
+_STORAGE_SIZE_COLUMN = u'5'
+
+_SNMP_PREFETCH_MAX_WORKERS = 8
+
+# Memoized structural portions of the oids map and metrics groups conf, shared across plugin instances. The
+# key spaces (device model, cpu interval oid and a couple of booleans/counts) are tiny, so the caches stay small.
+_OIDS_MAP_STRUCTURAL_CACHE = {}
+_METRICS_GROUPS_CACHE = {}
 
 
 class JuniperDeviceMetricsEnrichment(snmp.PanoptesGenericSNMPMetricsEnrichmentGroup):
@@ -32,9 +101,11 @@ class JuniperPluginEnrichmentDeviceMetrics(plugin_enrichment_generic_snmp.Panopt
         self._juniper_model = None
         super(JuniperPluginEnrichmentDeviceMetrics, self).__init__()
 
-    def _get_cpu_interval(self):
+    @lazy_once
+    def _cpu_interval_oid(self):
         """
-        Checks the self._execute_frequency to figure out the oid to use for cpu_utilization
+        Checks the polling frequency to figure out the oid to use for cpu_utilization; the frequency is fixed
+        for the lifetime of a run, so the oid is resolved once
         Returns:
             string: the oid to use.
         """
@@ -43,106 +114,180 @@ class JuniperPluginEnrichmentDeviceMetrics(plugin_enrichment_generic_snmp.Panopt
         if 5 <= self._polling_execute_frequency < 300:
             # TODO Need to divide by number of cores?
             # https://kb.juniper.net/InfoCenter/index?page=content&id=KB31764&cat=MX960_1&actp=LIST
-            return str(MibJuniper.jnxOperating1MinAvgCPU)
+            return _OID_CPU_1MIN
         elif 300 <= self._polling_execute_frequency < 900:
-            return str(MibJuniper.jnxOperating5MinAvgCPU)
+            return _OID_CPU_5MIN
         elif 900 <= self._polling_execute_frequency:
-            return str(MibJuniper.jnxOperating15MinAvgCPU)
+            return _OID_CPU_15MIN
         else:
-            return str(MibJuniper.jnxOperating1MinAvgCPU)
+            return _OID_CPU_1MIN
 
-    @threaded_cached_property
+    @lazy_once
     def _entity_names(self):
         entities = {}
-        varbinds = self._snmp_connection.bulk_walk(MibJuniper.jnxOperatingDescr.oid)
+        varbinds = self._snmp_connection.bulk_walk(_OID_ENTITY_DESCR,
+                                                   max_repetitions=self._snmp_max_repetitions)
         for varbind in varbinds:
-            value = varbind.value
-            if isinstance(value, bytes):
-                value = value.decode(u'ascii', u'ignore')  # pragma: no cover
-            entities[varbind.index] = value
+            entities[varbind.index] = self.decode_bytes(varbind.value)
 
         return entities
 
-    @threaded_cached_property
-    def _temp_sensors(self):
+    @lazy_once
+    def _sensor_names(self):
         """
         Returns:
-             dict: temperature stats for the system
+             dict: temperature sensor names for the system, keyed by sensor index
         """
-        temps = {}
-        varbinds = self._snmp_connection.bulk_walk(str(MibJuniper.jnxOperatingTemp))
+        sensor_names = {}
+        entity_names = self._entity_names
+        melting_point_steel = const.MELTING_POINT_STEEL
+        varbinds = self._snmp_connection.bulk_walk(_OID_TEMP,
+                                                   max_repetitions=self._snmp_max_repetitions)
         for varbind in varbinds:
-            if 0 < int(varbind.value) < const.MELTING_POINT_STEEL:
+            # the SNMP layer already types Gauge32 values as int; only cast when handed a string
+            value = varbind.value
+            if type(value) is not int:
+                value = int(value)
+            if 0 < value < melting_point_steel:
                 temp_id = varbind.index
-                temps[temp_id] = {u'sensor_name': self._entity_names[temp_id]}
-        return temps
+                sensor_names[temp_id] = entity_names[temp_id]
+        return sensor_names
+
+    @lazy_once
+    def _classified_entities(self):
+        """
+        Classifies every entity name as a cpu candidate, fan and/or power module in a single pass
+
+        The classifications are kept as flat parallel dicts keyed by entity index, so the oids map can reference
+        them directly instead of re-projecting a dict-of-dicts per poll.
+
+        Returns:
+            tuple: dicts of cpu candidate names, fan names, power module names and power module types
+        """
+        cpu_candidates = {}
+        fan_names = {}
+        pm_names = {}
+        pm_types = {}
+
+        for index, name in self._entity_names.items():
+            if _CPU_RE.search(name):
+                cpu_candidates[index] = name
+
+            if name.startswith(_FAN_LITERAL_PREFIXES) or _FAN_RE.match(name):
+                fan_names[index] = name
+
+            pm_type = None
+            for prefix, prefix_type in _PM_LITERAL_PREFIX_TYPES.items():
+                if name.startswith(prefix):
+                    pm_type = prefix_type
+                    break
+            if pm_type is None:
+                match = _PM_RE.match(name)
+                if match:
+                    pm_type = _PM_INDEX_TO_TYPE[match.lastindex - 1]
+            if pm_type is not None:
+                pm_names[index] = name
+                pm_types[index] = pm_type
 
-    @threaded_cached_property
+        return cpu_candidates, fan_names, pm_names, pm_types
+
+    @lazy_once
     def _cpus(self):
         """
         cpu will always be a Gauge32
         Returns:
-            dict: cpus in the system
+            tuple: parallel dicts of cpu names and cpu numbers, keyed by cpu index
         """
-        cpus = {}
-        varbinds = self._snmp_connection.bulk_walk(self._get_cpu_interval())
+        cpu_names = {}
+        cpu_nos = {}
+        cpu_candidates = self._classified_entities[0]
+        varbinds = self._snmp_connection.bulk_walk(self._cpu_interval_oid,
+                                                   max_repetitions=self._snmp_max_repetitions)
         for varbind in varbinds:
             # grab the last element of the index to use as the cpu_id
             cpu_id = varbind.index  # TODO trim off prepending OID?
 
-            for type in ['routing engine', 'fpc', 'fpm', 'cp', 'pic', 'fbc']:
-                if type in self._entity_names[cpu_id].lower():
-                    cpus[cpu_id] = {u'cpu_name': self._entity_names[cpu_id],
-                                    u'cpu_no': u'Module ' + str(cpu_id)}
-                    break
+            name = cpu_candidates.get(cpu_id)
+            if name is not None:
+                cpu_names[cpu_id] = name
+                cpu_nos[cpu_id] = u'Module ' + str(cpu_id)
+
+        return cpu_names, cpu_nos
+
+    @lazy_once
+    def _cpu_names(self):
+        return self._cpus[0]
 
-        return cpus
+    @lazy_once
+    def _cpu_nos(self):
+        return self._cpus[1]
 
-    @threaded_cached_property
-    def _memory(self):
+    @lazy_once
+    def _memory_total(self):
         """
         Returns:
-             dict: memory stats for the system
+             dict: total memory in bytes for the system, keyed by entity index; entities reporting zero
+             memory are skipped
         """
-        memory = {}
-        varbinds = self._snmp_connection.bulk_walk(str(MibJuniper.jnxOperatingMemory))
+        memory_total = {}
+        varbinds = self._snmp_connection.bulk_walk(_OID_MEMORY,
+                                                   max_repetitions=self._snmp_max_repetitions)
         for varbind in varbinds:
-            memory_id = varbind.index
-            memory[memory_id] = {u'memory_total': int(varbind.value) * (2 ** 20)}  # reported in megabytes
-        return memory
+            total = int(varbind.value)
+            if total != 0:
+                memory_total[varbind.index] = total * (2 ** 20)  # reported in megabytes
+        return memory_total
 
-    @threaded_cached_property
-    def _fans(self):
+    @lazy_once
+    def _fan_names(self):
         """
-        Reports fan status for Junipers.
+        Reports fan names for Junipers.
         Returns:
-            dict: fan metrics
+            dict: fan names keyed by entity index
         """
-        fans = {}
-        for index, name in list(self._entity_names.items()):
-            for type in FAN_TYPES:
-                if re.match(type, name):
-                    fans[index] = {u'name': name}
+        return self._classified_entities[1]
 
-        return fans
+    @lazy_once
+    def _pm_names(self):
+        """
+        Reports power entry module names for Juniper devices.
+        Returns:
+            dict: power module names keyed by entity index
+        """
+        return self._classified_entities[2]
 
-    @threaded_cached_property
-    def _power_modules(self):
+    @lazy_once
+    def _pm_types(self):
         """
-        Reports power entry module stats for Juniper devices.
+        Reports power entry module types for Juniper devices.
         Returns:
-            dict: power_supplies
+            dict: power module types keyed by entity index
+        """
+        return self._classified_entities[3]
+
+    @lazy_once
+    def _storage_table(self):
         """
-        power_modules = {}
-        for index, name in list(self._entity_names.items()):
-            for type in POWER_MODULE_TYPES:
-                if re.match(type, name):
-                    power_modules[index] = {u'name': name}
-                    power_modules[index][u'type'] = TYPE_MAP[type]
+        Walks hrStorageEntry once and demultiplexes the varbinds into per-column dicts keyed by storage index
+
+        The type, description, allocation units and size columns cover the same set of rows, so fetching them
+        through the parent entry costs a quarter of the SNMP round trips of four separate walks. When walking
+        the parent, varbind.index carries the column number as its first element.
 
-        return power_modules
+        Returns:
+            dict: a dict mapping each interesting column number to a dict of raw values keyed by storage index
+        """
+        table = {column: {} for column in (_STORAGE_TYPE_COLUMN, _STORAGE_DESCR_COLUMN,
+                                           _STORAGE_ALLOCATION_UNITS_COLUMN, _STORAGE_SIZE_COLUMN)}
+        varbinds = self._snmp_connection.bulk_walk(_OID_STORAGE_ENTRY,
+                                                   max_repetitions=self._snmp_max_repetitions)
+        for varbind in varbinds:
+            column, _, index = varbind.index.partition(u'.')
+            if column in table:
+                table[column][index] = varbind.value
+        return table
 
-    @threaded_cached_property
+    @lazy_once
     def _storage_descriptions(self):
         """
         Reports hrStorageDescriptions for Juniper devices.
@@ -154,13 +299,10 @@ class JuniperPluginEnrichmentDeviceMetrics(plugin_enrichment_generic_snmp.Panopt
             ...
         }
         """
-        storage_description = {}
-        varbinds = self._snmp_connection.bulk_walk(str(MibSNMPV2.hrStorageDescr))
-        for varbind in varbinds:
-            storage_description[varbind.index] = self.decode_bytes(varbind.value)
-        return storage_description
+        return {index: self.decode_bytes(value)
+                for index, value in self._storage_table[_STORAGE_DESCR_COLUMN].items()}
 
-    @threaded_cached_property
+    @lazy_once
     def _storage_type(self):
         """
         Returns hrStorageType for Juniper devices.
@@ -200,93 +342,139 @@ class JuniperPluginEnrichmentDeviceMetrics(plugin_enrichment_generic_snmp.Panopt
             '10': 'hrStorageNetworkDisk'
         }
 
-        storage_type = {}
-        varbinds = self._snmp_connection.bulk_walk(str(MibSNMPV2.hrStorageType))
-        for varbind in varbinds:
-            storage_type[varbind.index] = map_var_to_storage.get(self.decode_bytes(varbind.value).split(".")[-1], 'unknown')
-        return storage_type
+        return {index: map_var_to_storage.get(self.decode_bytes(value).split(".")[-1], 'unknown')
+                for index, value in self._storage_table[_STORAGE_TYPE_COLUMN].items()}
 
-    @threaded_cached_property
+    @lazy_once
     def _storage_allocation_units(self):
-        storage_block_size = {}
-        varbinds = self._snmp_connection.bulk_walk(str(MibSNMPV2.hrStorageAllocationUnits))
-        for varbind in varbinds:
-            storage_block_size[varbind.index] = int(varbind.value)
-        return storage_block_size
+        return {index: int(value)
+                for index, value in self._storage_table[_STORAGE_ALLOCATION_UNITS_COLUMN].items()}
 
-    @threaded_cached_property
+    @lazy_once
     def _storage_size(self):
         storage_size = {}
-        varbinds = self._snmp_connection.bulk_walk(str(MibSNMPV2.hrStorageSize))
-
         allocation_units = self._storage_allocation_units
 
-        for varbind in varbinds:
-            if varbind.index in list(allocation_units.keys()):
-                storage_size[varbind.index] = int(varbind.value) * allocation_units[varbind.index]
+        for index, value in self._storage_table[_STORAGE_SIZE_COLUMN].items():
+            allocation_unit = allocation_units.get(index)
+            if allocation_unit is not None:
+                storage_size[index] = int(value) * allocation_unit
         return storage_size
 
+    def _prefetch_snmp_data(self):
+        """
+        Resolves the SNMP-backed cached properties concurrently
+
+        Each property issues an independent bulk_walk, so resolving them serially during the oids map build makes
+        the enrichment latency bound on a high-RTT device. Walking the independent subtrees in parallel reduces the
+        wall time from the sum of the round trips to roughly the slowest one.
+        """
+        def resolve(property_names):
+            for property_name in property_names:
+                getattr(self, property_name)
+
+        # _sensor_names and _cpus read _entity_names; resolve it up front so the parallel batch finds it cached.
+        # Properties which depend on each other are resolved in order within a single chain, since lazy_once
+        # does not guard against a racing first access computing a property twice.
+        _ = self._entity_names
+
+        property_chains = [(u'_sensor_names',), (u'_cpus',), (u'_memory_total',)]
+
+        if self._plugin_conf.get(u'metrics_group', {}).get(u'include_disk_metrics_group', 0):
+            # the storage view properties are cheap demultiplexes of the single _storage_table walk
+            property_chains += [(u'_storage_table',)]
+
+        with ThreadPoolExecutor(max_workers=_SNMP_PREFETCH_MAX_WORKERS) as executor:
+            futures = [executor.submit(resolve, chain) for chain in property_chains]
+            for future in futures:
+                future.result()
+
     def _add_power_module_types_mapping(self):
-        types_mapping = {x: x for x in list(self._oids_map[u"power_module_types"][u"values"].values())}
+        # power_units_total's keys are exactly the module types present on the device, so reuse them instead of
+        # re-deriving the type set from the per-module values
+        types_mapping = {pm_type: pm_type for pm_type in self._oids_map[u"power_units_total"][u"values"]}
         self._oids_map[u"power_module_types"][u"values"].update(types_mapping)
 
     def _build_oids_map(self):
-        self._oids_map = {
+        include_disk_metrics_group = self._plugin_conf.get('metrics_group', {}).get('include_disk_metrics_group', 0)
+        cpu_interval_oid = self._cpu_interval_oid
+
+        structural_key = (self._juniper_model, cpu_interval_oid, bool(include_disk_metrics_group))
+        structural_entries = _OIDS_MAP_STRUCTURAL_CACHE.get(structural_key)
+
+        if structural_entries is None:
+            structural_entries = {
+                u"cpu_util": {
+                    u"method": u"bulk_walk",
+                    u"oid": _OID_CPU if 'EX4300' in self._juniper_model else cpu_interval_oid
+                },
+                u"memory_used": {
+                    u"method": u"bulk_walk",
+                    u"oid": _OID_BUFFER
+                },
+                u"oper_status": {
+                    u"method": u"bulk_walk",
+                    u"oid": _OID_STATE
+                },
+                u"temp_sensor_values": {
+                    u"method": u"bulk_walk",
+                    u"oid": _OID_TEMP
+                },
+            }
+
+            if include_disk_metrics_group:
+                structural_entries.update({
+                    u"storage_allocation_failures": {
+                        u"method": u"bulk_walk",
+                        u"oid": _OID_STORAGE_ALLOCATION_FAILURES
+                    },
+                    u"storage_used_bytes": {
+                        u"method": u"bulk_walk",
+                        u"oid": _OID_STORAGE_USED
+                    },
+                })
+
+            _OIDS_MAP_STRUCTURAL_CACHE[structural_key] = structural_entries
+
+        self._oids_map = dict(structural_entries)
+        self._oids_map.update({
             u"cpu_name": {
                 u"method": u"static",
-                u"values": {x: self._cpus[x][u'cpu_name'] for x in self._cpus}
+                u"values": self._cpu_names
             },
             u"cpu_no": {
                 u"method": u"static",
-                u"values": {x: self._cpus[x][u'cpu_no'] for x in self._cpus}
-            },
-            u"cpu_util": {
-                u"method": u"bulk_walk",
-                u"oid": MibJuniper.jnxOperatingCPU.oid if 'EX4300' in self._juniper_model else
-                    self._get_cpu_interval()
-            },
-            u"memory_used": {
-                u"method": u"bulk_walk",
-                u"oid": str(MibJuniper.jnxOperatingBuffer)
+                u"values": self._cpu_nos
             },
             u"memory_total": {
                 u"method": u"static",
-                u"values": {x: self._memory[x][u'memory_total'] for x in self._memory if
-                            self._memory[x][u'memory_total'] != 0}
-            },
-            u"oper_status": {
-                u"method": u"bulk_walk",
-                u"oid": str(MibJuniper.jnxOperatingState)
+                u"values": self._memory_total
             },
             u"fans": {
                 u"method": u"static",
-                u"values": {x: self._fans[x][u'name'] for x in self._fans}
+                u"values": self._fan_names
             },
             u"power_modules": {
                 u"method": u"static",
-                u"values": {x: self._power_modules[x][u'name'] for x in self._power_modules}
+                u"values": self._pm_names
             },
             u"power_module_types": {
                 u"method": u"static",
-                u"values": {x: self._power_modules[x][u'type'] for x in self._power_modules}
+                # copied because _add_power_module_types_mapping extends this entry in place
+                u"values": dict(self._pm_types)
             },
             u"power_units_total": {
                 u"method": u"static",
-                u"values": dict(collections.Counter([self._power_modules[x][u'type'] for x in self._power_modules]))
-            },
-            u"temp_sensor_values": {
-                u"method": u"bulk_walk",
-                u"oid": str(MibJuniper.jnxOperatingTemp)
+                u"values": dict(collections.Counter(self._pm_types.values()))
             },
             u"temp_sensor_name": {
                 u"method": u"static",
-                u"values": {x: self._temp_sensors[x][u'sensor_name'] for x in self._temp_sensors}
+                u"values": self._sensor_names
             },
-        }
-
-        if self._plugin_conf.get('metrics_group', {}).get('include_disk_metrics_group', 0):
+        })
 
-            oids_map = {
+        if include_disk_metrics_group:
+            self._oids_map.update({
                 u"storage_description": {
                     u"method": u"static",
                     u"values": self._storage_descriptions
@@ -295,29 +483,33 @@ class JuniperPluginEnrichmentDeviceMetrics(plugin_enrichment_generic_snmp.Panopt
                     u"method": u"static",
                     u"values": self._storage_type
                 },
-                u"storage_allocation_failures": {
-                    u"method": u"bulk_walk",
-                    u"oid": str(MibSNMPV2.hrStorageAllocationFailures)
-                },
                 u"storage_allocation_units": {
                     u"method": u"static",
                     u"values": self._storage_allocation_units
                 },
-                u"storage_used_bytes": {
-                    u"method": u"bulk_walk",
-                    u"oid": str(MibSNMPV2.hrStorageUsed)
-                },
                 u"storage_total_bytes": {
                     u"method": u"static",
                     u"values": self._storage_size
                 }
-            }
-
-            self._oids_map.update(oids_map)
+            })
 
         self._add_power_module_types_mapping()
 
     def _build_metrics_groups_conf(self):
+        # check the config gate first: touching _storage_descriptions triggers the storage table walk, which
+        # must not happen for devices with disk metrics disabled
+        include_storage_group = self._plugin_conf.get('metrics_group', {}).get('include_disk_metrics_group', 0) \
+            and self._storage_descriptions
+
+        # The groups conf only varies with the gates below; reuse the built list when they are unchanged. The
+        # conf is serialized into the enrichment set and never mutated downstream, so sharing it is safe.
+        cache_key = (bool(self._pm_names), len(self._fan_names), bool(include_storage_group))
+        cached_groups = _METRICS_GROUPS_CACHE.get(cache_key)
+
+        if cached_groups is not None:
+            self._metrics_groups = cached_groups
+            return
+
         self._metrics_groups = [
             {
                 u"group_name": u"environment",
@@ -366,7 +558,7 @@ class JuniperPluginEnrichmentDeviceMetrics(plugin_enrichment_generic_snmp.Panopt
             },
         ]
 
-        if len(self._power_modules) > 0:
+        if len(self._pm_names) > 0:
             self._metrics_groups.append(
                 {
                     u"group_name": u"environment",
@@ -377,9 +569,8 @@ class JuniperPluginEnrichmentDeviceMetrics(plugin_enrichment_generic_snmp.Panopt
                         u"power_units_on": {
                             u"metric_type": u"gauge",
                             u"indices_from": u"power_units_total",
-                            u"value": u"len([(x,y) for (x,y) in oper_status.items() if x in "
-                                      u"power_module_types and y not in "
-                                      u"['6'] and power_module_types[x] == $index])"
+                            u"value": u"sum(1 for x,y in oper_status.items() if y!='6' "
+                                      u"and power_module_types.get(x)==$index)"
                         },
                         u"power_units_total": {
                             u"metric_type": u"gauge",
@@ -389,7 +580,7 @@ class JuniperPluginEnrichmentDeviceMetrics(plugin_enrichment_generic_snmp.Panopt
                 }
             )
 
-        if len(self._fans) > 0:
+        if len(self._fan_names) > 0:
             self._metrics_groups.append(
                 {
                     u"group_name": u"environment",
@@ -397,15 +588,14 @@ class JuniperPluginEnrichmentDeviceMetrics(plugin_enrichment_generic_snmp.Panopt
                     u"metrics": {
                         u"fans_ok": {
                             u"metric_type": u"gauge",
-                            u"value": u"len([(x,y) for (x,y) in oper_status.items() if x in fans and y not in ['6']])"
+                            u"value": u"sum(1 for x,y in oper_status.items() if x in fans and y!='6')"
                         },
-                        u"fans_total": len(self._fans)
+                        u"fans_total": len(self._fan_names)
                     }
                 }
             )
 
-        if len(list(self._storage_descriptions.keys())) > 0 and \
-                self._plugin_conf.get('metrics_group', {}).get('include_disk_metrics_group', 0):
+        if include_storage_group:
             self._metrics_groups.append(
                 {
                     u"group_name": u"disk",
@@ -430,6 +620,8 @@ class JuniperPluginEnrichmentDeviceMetrics(plugin_enrichment_generic_snmp.Panopt
                 },
             )
 
+        _METRICS_GROUPS_CACHE[cache_key] = self._metrics_groups
+
     @property
     def metrics_enrichment_class(self):
         return JuniperDeviceMetricsEnrichment
@@ -437,6 +629,7 @@ class JuniperPluginEnrichmentDeviceMetrics(plugin_enrichment_generic_snmp.Panopt
     def get_enrichment(self):
         self._juniper_model = self._plugin_context.data.resource_metadata.get(u'model', u'unknown')
 
+        self._prefetch_snmp_data()
         self._build_oids_map()
         self._build_metrics_groups_conf()
 
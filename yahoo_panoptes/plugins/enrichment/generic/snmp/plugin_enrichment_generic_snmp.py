@@ -15,6 +15,10 @@ _DEFAULT_SNMP_NON_REPEATERS = 0
 _DEFAULT_SNMP_MAX_REPETITIONS = 25
 _DEFAULT_METRICS_SCHEMA_NAMESPACE = u'metrics'
 
+# Deleting the non-ASCII range and decoding the remainder as latin-1 yields the same result as
+# decode('ascii', 'ignore') without paying for error-handler dispatch on every value
+_NON_ASCII_DELETE = bytes(range(0x80, 0x100))
+
 
 class PanoptesEnrichmentGenericSNMPPlugin(PanoptesEnrichmentPlugin):
     def __init__(self):
@@ -123,8 +127,8 @@ class PanoptesEnrichmentGenericSNMPPlugin(PanoptesEnrichmentPlugin):
         return device_results
 
     def decode_bytes(self, maybe_bytes):
-        if isinstance(maybe_bytes, bytes):
-            return maybe_bytes.decode('ascii', 'ignore')
+        if isinstance(maybe_bytes, (bytes, bytearray)):
+            return maybe_bytes.translate(None, _NON_ASCII_DELETE).decode('latin-1')
         # string
         return maybe_bytes
 
@@ -56,6 +56,29 @@ def _identity(x):
     return x
 
 
+_EXPRESSION_CODE_CACHE = {}
+
+
+def _compile_expression(expression):
+    """
+    Compile and memoize an eval expression.
+
+    The parsed metric/dimension expressions and transform strings repeat across indices, polls and plugin
+    instances, so caching the compiled code objects avoids re-parsing the same source for every data point.
+    The cache is bounded by the number of distinct expressions in the loaded enrichments.
+
+    Args:
+        expression (str): The expression to compile
+
+    Returns:
+        The compiled code object, suitable for passing to eval
+    """
+    code_object = _EXPRESSION_CODE_CACHE.get(expression)
+    if code_object is None:
+        code_object = _EXPRESSION_CODE_CACHE[expression] = compile(expression, u'<enrichment-expression>', u'eval')
+    return code_object
+
+
 class PanoptesMetricDimensionException(exceptions.PanoptesBaseException):
     pass
 
@@ -468,7 +491,7 @@ class PluginPollingGenericSNMPMetrics(polling_plugin.PanoptesPollingPlugin):
 
             if u"transform" in target_map:
                 try:
-                    transform = eval(target_map[u'transform'], {'self': self})
+                    transform = eval(_compile_expression(target_map[u'transform']), {'self': self})
                 except Exception as e:
                     self._logger.warn(u'Error on "%s" (%s) in namespace "%s" while evaluating '
                                       u'"transform": %s: %s' %
@@ -486,11 +509,20 @@ class PluginPollingGenericSNMPMetrics(polling_plugin.PanoptesPollingPlugin):
                 # For non-indexed metrics, insert at top level of metrics_type_map
                 metrics_type_map[target] = _METRIC_TYPE_MAP[target_map[u"metric_type"]]
 
+            try:
+                parsed_expression_code = _compile_expression(parsed_expression)
+            except Exception as e:
+                self._logger.warn(u'Error on "%s" (%s) in namespace "%s" while compiling '
+                                  u'expression "%s": %s' %
+                                  (self._device_host, self._device_model, self._namespace,
+                                   parsed_expression, repr(e)))
+                continue
+
             if self._has_indices(target_map):
                 for index in indices:
                     try:
                         # make sure ints are processed correctly
-                        value = eval(parsed_expression, {'self': self, 'index': index})
+                        value = eval(parsed_expression_code, {'self': self, 'index': index})
 
                         if index not in targets_map:
                             targets_map[index] = dict()
@@ -503,7 +535,7 @@ class PluginPollingGenericSNMPMetrics(polling_plugin.PanoptesPollingPlugin):
                         continue
             else:
                 try:
-                    value = eval(parsed_expression, {'self': self})
+                    value = eval(parsed_expression_code, {'self': self})
 
                 except Exception as e:
                     self._logger.warn(u'Error on "%s" (%s) in namespace "%s" while processing '